@@ -7,6 +7,7 @@ Expose the most common functions so users can do:
 """
 
 from .canmlio import load_dbc_files, iter_blf_chunks, load_blf, to_csv, to_parquet
+from .canmlio import to_parquet_stream
 from .canmlio import CanmlConfig
 
 __all__ = [
@@ -15,6 +16,7 @@ __all__ = [
     "load_blf",
     "to_csv",
     "to_parquet",
+    "to_parquet_stream",
     "CanmlConfig",
     "__version__",
 ]
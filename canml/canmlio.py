@@ -47,17 +47,25 @@ Example:
 """
 import logging
 import json
+import multiprocessing
+import os
+import queue
+import threading
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Container, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from dataclasses import dataclass
 from functools import lru_cache
-from collections import Counter
 
 import numpy as np
 import pandas as pd
 import cantools
 from cantools.database.can import Database as CantoolsDatabase
+from cantools.database.errors import DecodeError
+from can.io import blf as _blf
 from can.io.blf import BLFReader
 from tqdm import tqdm
 
@@ -68,6 +76,7 @@ __all__ = [
     "load_blf",
     "to_csv",
     "to_parquet",
+    "to_parquet_stream",
 ]
 
 # ----------------------------------------------------------------------------
@@ -96,10 +105,28 @@ class CanmlConfig:
         sort_timestamps (bool): Sort by timestamp. Defaults to False.
         force_uniform_timing (bool): Uniform spacing of timestamps. Defaults to False.
         interval_seconds (float): Uniform interval seconds. Defaults to 0.01.
-        interpolate_missing (bool): Interpolate missing signals. Defaults to False.
+        interpolate_missing (bool): Fill gaps in decoded signals. Defaults to False.
+        interpolation_method (str): Gap filling: 'linear' interpolates over
+            timestamps, 'zoh' holds the last sample. Enum signals are always
+            held. Defaults to 'linear'.
+        n_workers (int): Processes decoding frames in parallel; 1 decodes in
+            the calling process. Defaults to 1.
+        raw_frame_reader (bool): Parse BLF objects straight into raw frame
+            tuples instead of can.Message objects; remote and error frames
+            are skipped. Defaults to False.
+        narrow_dtypes (bool): Store decoded signals in the narrowest dtype
+            their DBC definition allows instead of float64: unscaled integer
+            signals without gaps become (u)int8-64, scaled signals float32.
+            dtype_map entries take precedence. Defaults to False.
+        prefetch (bool): Read and decompress the BLF file on a background
+            thread while frames are decoded. Combined with n_workers > 1 the
+            pool workers are started with forkserver (spawn where that is
+            unavailable) rather than forked from the threaded process.
+            Defaults to False.
 
     Raises:
-        ValueError: If chunk_size or interval_seconds <= 0.
+        ValueError: If chunk_size, interval_seconds or n_workers is out of
+            range, or interpolation_method is unknown.
     """
     chunk_size: int = 10000
     progress_bar: bool = True
@@ -108,16 +135,33 @@ class CanmlConfig:
     force_uniform_timing: bool = False
     interval_seconds: float = 0.01
     interpolate_missing: bool = False
+    interpolation_method: str = "linear"
+    n_workers: int = 1
+    raw_frame_reader: bool = False
+    narrow_dtypes: bool = False
+    prefetch: bool = False
 
     def __post_init__(self):
         if self.chunk_size <= 0:
             raise ValueError("chunk_size must be positive")
         if self.interval_seconds <= 0:
             raise ValueError("interval_seconds must be positive")
+        if self.interpolation_method not in ("linear", "zoh"):
+            raise ValueError("interpolation_method must be 'linear' or 'zoh'")
+        if self.n_workers < 1:
+            raise ValueError("n_workers must be at least 1")
 
 # ----------------------------------------------------------------------------
 # DBC loading and merging with safe signal prefixing
 # ----------------------------------------------------------------------------
+def _duplicate_names(names: Iterable[str]) -> List[str]:
+    """
+    Internal: Return the sorted names occurring more than once.
+    """
+    uniq, counts = np.unique(np.fromiter(names, dtype=object), return_counts=True)
+    return [str(n) for n in uniq[counts > 1]]
+
+
 @lru_cache(maxsize=32)
 def _load_dbc_files_cached(
     dbc_paths: Union[str, Tuple[str, ...]], prefix_signals: bool
@@ -145,16 +189,14 @@ def _load_dbc_files_cached(
             raise ValueError(f"Invalid DBC file {pth}: {e}") from e
 
     # Prefixing logic
-    all_signals = [sig.name for msg in db.messages for sig in msg.signals]
     if not prefix_signals:
-        dupes = [n for n, c in Counter(all_signals).items() if c > 1]
+        dupes = _duplicate_names(sig.name for msg in db.messages for sig in msg.signals)
         if dupes:
             raise ValueError(
-                f"Duplicate signal names: {sorted(dupes)}; use prefix_signals=True"
+                f"Duplicate signal names: {dupes}; use prefix_signals=True"
             )
     else:
-        msg_names = [msg.name for msg in db.messages]
-        dup_msgs = [n for n, c in Counter(msg_names).items() if c > 1]
+        dup_msgs = _duplicate_names(msg.name for msg in db.messages)
         for idx, msg in enumerate(db.messages):
             if dup_msgs:
                 if hasattr(msg, 'frame_id'):
@@ -183,12 +225,171 @@ def load_dbc_files(
 # ----------------------------------------------------------------------------
 # BLFReader context manager
 # ----------------------------------------------------------------------------
+class _RawFrameBLFReader(BLFReader):
+    """
+    Internal: BLFReader yielding ``(arbitration_id, data, timestamp)`` tuples.
+
+    Reuses python-can's container framing and decompression, but unpacks
+    CAN and CAN FD objects straight into tuples instead of constructing a
+    can.Message per frame. Remote and error frames carry no signal data
+    and are skipped.
+    """
+
+    def _parse_data(self, data):
+        unpack_obj_header_base = _blf.OBJ_HEADER_BASE_STRUCT.unpack_from
+        obj_header_base_size = _blf.OBJ_HEADER_BASE_STRUCT.size
+        unpack_obj_header_v1 = _blf.OBJ_HEADER_V1_STRUCT.unpack_from
+        obj_header_v1_size = _blf.OBJ_HEADER_V1_STRUCT.size
+        unpack_obj_header_v2 = _blf.OBJ_HEADER_V2_STRUCT.unpack_from
+        obj_header_v2_size = _blf.OBJ_HEADER_V2_STRUCT.size
+        unpack_can_msg = _blf.CAN_MSG_STRUCT.unpack_from
+        unpack_can_fd_msg = _blf.CAN_FD_MSG_STRUCT.unpack_from
+        unpack_can_fd_64_msg = _blf.CAN_FD_MSG_64_STRUCT.unpack_from
+        can_fd_64_msg_size = _blf.CAN_FD_MSG_64_STRUCT.size
+        can_msg_types = (_blf.CAN_MESSAGE, _blf.CAN_MESSAGE2)
+        remote_flag = _blf.REMOTE_FLAG
+
+        start_timestamp = self.start_timestamp
+        max_pos = len(data)
+        pos = 0
+        while True:
+            self._pos = pos
+            try:
+                pos = data.index(b"LOBJ", pos, pos + 8)
+            except ValueError:
+                if pos + 8 > max_pos:
+                    # Not enough data in container
+                    return
+                raise _blf.BLFParseError("Could not find next object") from None
+            _, _, header_version, obj_size, obj_type = unpack_obj_header_base(data, pos)
+            next_pos = pos + obj_size
+            if next_pos > max_pos:
+                # This object continues in the next container
+                return
+            pos += obj_header_base_size
+
+            if header_version == 1:
+                flags, _, _, timestamp = unpack_obj_header_v1(data, pos)
+                pos += obj_header_v1_size
+            elif header_version == 2:
+                flags, _, _, timestamp = unpack_obj_header_v2(data, pos)
+                pos += obj_header_v2_size
+            else:
+                glogger.warning(f"Unknown object header version ({header_version})")
+                pos = next_pos
+                continue
+            timestamp = timestamp * (1e-5 if flags == 1 else 1e-9) + start_timestamp
+
+            if obj_type in can_msg_types:
+                _, msg_flags, dlc, can_id, can_data = unpack_can_msg(data, pos)
+                if not msg_flags & remote_flag:
+                    yield can_id & 0x1FFFFFFF, can_data[:dlc], timestamp
+            elif obj_type == _blf.CAN_FD_MESSAGE:
+                _, msg_flags, _, can_id, _, _, _, valid, can_data = unpack_can_fd_msg(data, pos)
+                if not msg_flags & remote_flag:
+                    yield can_id & 0x1FFFFFFF, can_data[:valid], timestamp
+            elif obj_type == _blf.CAN_FD_MESSAGE_64:
+                members = unpack_can_fd_64_msg(data, pos)
+                if not members[6] & 0x0010:
+                    start = pos + can_fd_64_msg_size
+                    yield members[4] & 0x1FFFFFFF, data[start:start + members[2]], timestamp
+            pos = next_pos
+
+
+class _PrefetchReader:
+    """
+    Internal: Iterate a reader on a background thread, handing over batches.
+
+    Items are collected into lists of ``batch_size`` and passed through a
+    queue bounded to ``depth`` batches, so file reads and zlib
+    decompression (which releases the GIL) overlap with decoding in the
+    consuming thread. Reader errors are re-raised in the consumer.
+    """
+
+    _DONE = object()
+
+    def __init__(self, source: Iterable[Any], batch_size: int = 4096, depth: int = 4):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(iter(source), batch_size),
+            name="canml-blf-prefetch", daemon=True,
+        )
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, source: Iterator[Any], batch_size: int) -> None:
+        try:
+            while True:
+                batch = list(islice(source, batch_size))
+                if not batch:
+                    break
+                if not self._put(batch):
+                    return
+        except BaseException as e:
+            self._put(e)
+            return
+        self._put(self._DONE)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield from item
+
+    def close(self) -> None:
+        """
+        Stop the reading thread and wait for it to exit.
+        """
+        self._stop.set()
+        self._thread.join()
+
+
+def _advise_sequential(reader: Any) -> None:
+    """
+    Internal: Hint the OS that the reader's file is read front to back.
+    """
+    fadvise = getattr(os, "posix_fadvise", None)
+    fh = getattr(reader, "file", None)
+    if fadvise is None or fh is None:
+        return
+    try:
+        fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
 @contextmanager
-def blf_reader(path: str) -> Iterator[BLFReader]:
-    reader = BLFReader(str(path))
+def blf_reader(
+    path: str, raw_frames: bool = False, prefetch: bool = False
+) -> Iterator[Iterable[Any]]:
+    """
+    Open a BLF file for reading and stop the reader on exit.
+
+    With ``raw_frames`` the reader yields ``(arbitration_id, data,
+    timestamp)`` tuples instead of can.Message objects. With ``prefetch``
+    the file is read on a background thread and an iterable over the
+    same items is yielded instead of the reader.
+    """
+    reader = (_RawFrameBLFReader if raw_frames else BLFReader)(str(path))
+    _advise_sequential(reader)
+    prefetcher = _PrefetchReader(reader) if prefetch else None
     try:
-        yield reader
+        yield reader if prefetcher is None else prefetcher
     finally:
+        if prefetcher is not None:
+            prefetcher.close()
         try:
             reader.stop()
         except Exception:
@@ -198,21 +399,399 @@ def blf_reader(path: str) -> Iterator[BLFReader]:
 # Stream-decode BLF in chunks with drop summary
 # ----------------------------------------------------------------------------
 
+# (arbitration_id, data, timestamp) of one raw CAN frame
+_RawFrame = Tuple[int, Any, float]
+# frame_id -> (message definition, (signal name, column index) pairs)
+_Decoders = Dict[int, Tuple[Any, Tuple[Tuple[str, int], ...]]]
+# timestamp buffer, per-signal value buffers, per-signal presence masks
+_Buffers = Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]]
+# frame_id -> scatter(data, row, cols, mask), True when the row was filled
+_Scatters = Dict[int, Callable[[Any, int, List[np.ndarray], List[np.ndarray]], bool]]
+
+
+def _signal_dtype(sig: Any) -> np.dtype:
+    """
+    Internal: Buffer dtype holding the decoded values of sig exactly.
+
+    Integer signals with integral scale and offset decode to ints in
+    cantools and get int64, or uint64 when their range exceeds it (e.g.
+    unsigned 64-bit counters), since float64 rounds integers above 2**53.
+    Everything else, and signals lacking the attributes, get float64.
+    """
+    try:
+        if sig.is_float:
+            return np.dtype(np.float64)
+        scale, offset, length = float(sig.scale), float(sig.offset), int(sig.length)
+        signed = bool(sig.is_signed)
+    except (AttributeError, TypeError, ValueError):
+        return np.dtype(np.float64)
+    if not (scale.is_integer() and offset.is_integer()):
+        return np.dtype(np.float64)
+    if signed:
+        lo, hi = -(1 << (length - 1)), (1 << (length - 1)) - 1
+    else:
+        lo, hi = 0, (1 << length) - 1
+    ends = (lo * int(scale) + int(offset), hi * int(scale) + int(offset))
+    low, high = min(ends), max(ends)
+    if -(1 << 63) <= low and high < (1 << 63):
+        return np.dtype(np.int64)
+    if low >= 0 and high < (1 << 64):
+        return np.dtype(np.uint64)
+    return np.dtype(np.float64)
+
+
+def _alloc_buffers(
+    size: int, ncols: int, dtypes: Optional[Sequence[np.dtype]] = None
+) -> _Buffers:
+    """
+    Internal: Allocate empty columnar buffers for one chunk.
+
+    Value buffers take the per-column ``dtypes``, float64 by default.
+    """
+    if dtypes is None:
+        dtypes = (np.float64,) * ncols
+    return (
+        np.empty(size, dtype=np.float64),
+        [np.empty(size, dtype=dt) for dt in dtypes],
+        [np.zeros(size, dtype=bool) for _ in range(ncols)],
+    )
+
+
+def _buffers_to_frame(
+    col_idx: Dict[str, int],
+    buffers: _Buffers,
+    nrows: int,
+    fill: Container[int] = (),
+) -> pd.DataFrame:
+    """
+    Internal: Wrap the first nrows of chunk buffers into a DataFrame.
+
+    Partially present signals become float64 with NaN where absent (as
+    pandas does for integer data with gaps); signals never present are
+    omitted unless their column index is in ``fill``, which makes them
+    all-NaN float64. Like pandas inference, uint64 columns whose values all
+    fit are returned as int64.
+    """
+    ts, cols, mask = buffers
+    data: Dict[str, np.ndarray] = {"timestamp": ts[:nrows]}
+    for name, i in col_idx.items():
+        present = mask[i][:nrows]
+        if present.all():
+            col = cols[i][:nrows]
+            if col.dtype == np.uint64 and not (col >> np.uint64(63)).any():
+                col = col.view(np.int64)
+            data[name] = col
+        elif present.any():
+            data[name] = np.where(present, cols[i][:nrows], np.nan)
+        elif i in fill:
+            data[name] = np.full(nrows, np.nan)
+    return pd.DataFrame(data, copy=False)
+
+
+def _fallback_scatter(m: Any, plan: Tuple[Tuple[str, int], ...]) -> Callable:
+    """
+    Internal: Scatter closure decoding through cantools ``Message.decode``.
+
+    Short payloads are rejected before decoding; only cantools' DecodeError
+    (e.g. an unknown multiplexer value) drops a frame, other errors surface.
+    """
+    length = getattr(m, "length", 0)
+
+    def scatter(data, row, cols, mask):
+        if len(data) < length:
+            return False
+        try:
+            rec = m.decode(data, decode_choices=False)
+        except DecodeError:
+            return False
+        hit = False
+        for name, i in plan:
+            # multiplexed messages decode only the active signals
+            v = rec.get(name)
+            if v is not None:
+                cols[i][row] = v
+                mask[i][row] = True
+                hit = True
+        return hit
+    return scatter
+
+
+def _compiled_scatter(m: Any, plan: Tuple[Tuple[str, int], ...]) -> Optional[Callable]:
+    """
+    Internal: Generate a scatter function unpacking the planned signals of m.
+
+    The payload is read as one integer and each signal is shifted, masked,
+    sign-extended and scaled exactly as cantools does, without building a
+    dict per frame. Returns None for messages this cannot express
+    (multiplexed, container or float signals, non-linear conversions).
+    """
+    try:
+        if m.is_multiplexed() or getattr(m, "is_container", False):
+            return None
+        length = int(m.length)
+        signals = {s.name: s for s in m.signals}
+    except Exception:
+        return None
+    nbits = 8 * length
+    lines = [
+        "def scatter(data, row, cols, mask):",
+        f"    if len(data) < {length}:",
+        "        return False",
+    ]
+    orders = set()
+    assigns = []
+    for name, i in plan:
+        s = signals.get(name)
+        conv = getattr(s, "conversion", None)
+        if s is None or s.is_float or not hasattr(conv, "scale"):
+            return None
+        if s.byte_order == "little_endian":
+            word, shift = "le", s.start
+        elif s.byte_order == "big_endian":
+            netstart = 8 * (s.start // 8) + (7 - s.start % 8)
+            word, shift = "be", nbits - (netstart + s.length)
+        else:
+            return None
+        if shift < 0:
+            return None
+        orders.add(word)
+        expr = f"(({word} >> {shift}) & {(1 << s.length) - 1})"
+        if s.is_signed:
+            sign = 1 << (s.length - 1)
+            expr = f"(({expr} ^ {sign}) - {sign})"
+        # Same arithmetic as cantools so values stay bit-identical; integral
+        # scale and offset keep the value an exact int, as cantools does
+        scale, offset = conv.scale, conv.offset
+        if float(scale).is_integer() and float(offset).is_integer():
+            scale, offset = int(scale), int(offset)
+        if not (scale == 1 and offset == 0):
+            expr = f"{expr} * {scale!r} + {offset!r}"
+        assigns.append(f"    cols[{i}][row] = {expr}")
+        assigns.append(f"    mask[{i}][row] = True")
+    for word, order in (("le", "little"), ("be", "big")):
+        if word in orders:
+            lines.append(f"    {word} = int.from_bytes(data[:{length}], {order!r})")
+    lines.extend(assigns)
+    lines.append("    return True")
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["scatter"]
+
+
+def _compile_decoders(decoders: _Decoders) -> _Scatters:
+    """
+    Internal: Build the per-frame-id scatter functions for a decoder table.
+    """
+    return {
+        fid: _compiled_scatter(m, plan) or _fallback_scatter(m, plan)
+        for fid, (m, plan) in decoders.items()
+    }
+
+
+def _decode_frames(
+    scatters: _Scatters,
+    dtypes: Sequence[np.dtype],
+    frames: Iterator[_RawFrame],
+    size: int,
+) -> Tuple[int, int, _Buffers]:
+    """
+    Internal: Decode raw frames into fresh columnar buffers.
+
+    Consumes ``frames`` until ``size`` rows are decoded or it is exhausted,
+    and returns the number of frames read, the rows decoded and the buffers.
+    """
+    buffers = _alloc_buffers(size, len(dtypes), dtypes)
+    ts, cols, mask = buffers
+    read = row = 0
+    for arb_id, data, stamp in frames:
+        read += 1
+        scatter = scatters.get(arb_id)
+        if scatter is not None and scatter(data, row, cols, mask):
+            ts[row] = stamp
+            row += 1
+            if row == size:
+                break
+    return read, row, buffers
+
+
+def _decode_serial(
+    decoders: _Decoders,
+    dtypes: Sequence[np.dtype],
+    frames: Iterator[_RawFrame],
+    size: int,
+) -> Iterator[Tuple[int, int, _Buffers]]:
+    """
+    Internal: Decode frames chunk by chunk in the calling process.
+    """
+    scatters = _compile_decoders(decoders)
+    while True:
+        read, rows, buffers = _decode_frames(scatters, dtypes, frames, size)
+        if not read:
+            return
+        yield read, rows, buffers
+        if rows < size:
+            return
+
+
+_worker_scatters: _Scatters = {}
+_worker_dtypes: Sequence[np.dtype] = ()
+
+
+def _init_decode_worker(decoders: _Decoders, dtypes: Sequence[np.dtype]) -> None:
+    """
+    Internal: Compile the decoder table in a pool worker process.
+
+    Generated functions do not pickle, so each worker compiles its own.
+    """
+    global _worker_scatters, _worker_dtypes
+    _worker_scatters = _compile_decoders(decoders)
+    _worker_dtypes = dtypes
+
+
+def _decode_batch(batch: List[_RawFrame]) -> Tuple[int, int, _Buffers]:
+    """
+    Internal: Pool task decoding one batch of raw frames.
+    """
+    return _decode_frames(_worker_scatters, _worker_dtypes, iter(batch), len(batch))
+
+
+def _decode_parallel(
+    decoders: _Decoders,
+    dtypes: Sequence[np.dtype],
+    frames: Iterator[_RawFrame],
+    size: int,
+    n_workers: int,
+    mp_context: Optional[Any] = None,
+) -> Iterator[Tuple[int, int, _Buffers]]:
+    """
+    Internal: Decode batches of ``size`` frames in a process pool.
+
+    Frames are read and id-filtered in the calling process; at most two
+    batches per worker are in flight and results are yielded in file order.
+    ``mp_context`` selects how workers are started (platform default if
+    None).
+    """
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=mp_context,
+        initializer=_init_decode_worker,
+        initargs=(decoders, dtypes),
+    ) as pool:
+        pending: Deque[Tuple[int, Future]] = deque()
+        while True:
+            batch = list(islice(frames, size))
+            if batch:
+                wanted = [f for f in batch if f[0] in decoders]
+                pending.append((len(batch), pool.submit(_decode_batch, wanted)))
+            elif not pending:
+                return
+            if not batch or len(pending) >= 2 * n_workers:
+                read, future = pending.popleft()
+                _, rows, buffers = future.result()
+                yield read, rows, buffers
+
+
+def _thread_safe_mp_context() -> Any:
+    """
+    Internal: Multiprocessing context that does not fork the caller.
+
+    Forking while another thread runs (e.g. the prefetch reader) can copy a
+    held lock into the child and deadlock it; forkserver and spawn start
+    workers from a clean process.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _decode_generic(
+    db: Any,
+    col_idx: Dict[str, int],
+    filter_ids: Optional[FrozenSet[int]],
+    sig_set: Optional[Set[str]],
+    frames: Iterator[_RawFrame],
+    size: int,
+) -> Iterator[Tuple[int, int, _Buffers]]:
+    """
+    Internal: Decode frames through ``db.decode_message``.
+
+    Used for databases without message definitions; decoded names missing
+    from ``col_idx`` are appended to it on first sight.
+    """
+    read = row = 0
+    buffers = _alloc_buffers(size, len(col_idx))
+    ts, cols, mask = buffers
+    for arb_id, data, stamp in frames:
+        read += 1
+        if filter_ids is not None and arb_id not in filter_ids:
+            continue
+        try:
+            rec = db.decode_message(arb_id, data)
+        except Exception:
+            continue
+        hit = False
+        for k, v in rec.items():
+            i = col_idx.get(k)
+            if i is None:
+                if sig_set is not None and k not in sig_set:
+                    continue
+                i = col_idx[k] = len(cols)
+                cols.append(np.empty(size, dtype=np.float64))
+                mask.append(np.zeros(size, dtype=bool))
+            cols[i][row] = getattr(v, "value", v)
+            mask[i][row] = True
+            hit = True
+        if not hit:
+            continue
+        ts[row] = stamp
+        row += 1
+        if row == size:
+            yield read, row, buffers
+            read = row = 0
+            buffers = _alloc_buffers(size, len(col_idx))
+            ts, cols, mask = buffers
+    if read:
+        yield read, row, buffers
+
+
 def iter_blf_chunks(
     blf_path: str,
     db: CantoolsDatabase,
     config: CanmlConfig,
-    filter_ids: Optional[Set[int]] = None,
+    filter_ids: Optional[Iterable[int]] = None,
     filter_signals: Optional[Iterable[Any]] = None,
+    fill_missing: bool = False,
 ) -> Iterator[pd.DataFrame]:
     """
     Stream-decode a BLF file into pandas DataFrame chunks.
 
+    Decoded values are scattered into preallocated per-signal NumPy buffers
+    (one column per signal plus a presence mask) and wrapped into a
+    DataFrame once per chunk, so no per-frame dict or dtype inference is
+    needed. Signals absent from a frame are NaN; signals never seen in a
+    chunk are omitted from it. Enum signals hold their raw values.
+
+    Column dtypes follow what cantools decodes: integer signals with
+    integral scale and offset are int64 (uint64 for ranges beyond int64)
+    and stay exact at any width, other signals are float64. A column with
+    gaps in a chunk becomes float64, as pandas does for such data.
+
+    With ``fill_missing`` every chunk carries the same columns: all wanted
+    signals of the messages being decoded, all-NaN where a chunk has none
+    of their frames. Chunk-by-chunk writers such as to_parquet_stream need
+    this when messages first appear after the first chunk. Databases
+    without message definitions only fill signals already seen.
+
+    With ``config.n_workers > 1`` and a cantools database, batches of
+    ``chunk_size`` frames are decoded in a process pool; chunks then hold
+    at most ``chunk_size`` rows.
+
     Logs total vs dropped message counts.
     """
     p = Path(blf_path)
     if p.suffix.lower() != ".blf" or not p.is_file():
         raise FileNotFoundError(f"Valid BLF file not found: {p}")
+    # An empty filter means no filtering
+    filter_ids = frozenset(filter_ids) if filter_ids else None
 
     sig_set: Optional[Set[str]] = None
     if filter_signals is not None:
@@ -223,39 +802,240 @@ def iter_blf_chunks(
             except Exception:
                 continue
 
-    total = 0
-    dropped = 0
-    buffer: List[Dict[str, Any]] = []
-    with blf_reader(blf_path) as reader:
-        it = tqdm(reader, desc=p.name) if config.progress_bar else reader
-        for msg in it:
-            total += 1
-            if filter_ids and msg.arbitration_id not in filter_ids:
-                dropped += 1
-                continue
-            try:
-                rec = db.decode_message(msg.arbitration_id, msg.data)
-            except Exception:
-                dropped += 1
+    # Column layout from the DBC; names a database decodes without declaring
+    # them up front are appended on first sight.
+    col_idx: Dict[str, int] = {}
+    dtypes: List[np.dtype] = []
+    for m in getattr(db, "messages", ()):
+        for s in m.signals:
+            if sig_set is not None and s.name not in sig_set:
                 continue
-            if sig_set is not None:
-                rec = {k: v for k, v in rec.items() if k in sig_set}
-            if rec:
-                rec["timestamp"] = msg.timestamp
-                buffer.append(rec)
+            i = col_idx.get(s.name)
+            if i is None:
+                col_idx[s.name] = len(dtypes)
+                dtypes.append(_signal_dtype(s))
             else:
-                dropped += 1
-            if len(buffer) >= config.chunk_size:
-                yield pd.DataFrame(buffer)
-                buffer.clear()
-        if buffer:
-            yield pd.DataFrame(buffer)
-    glogger.info(f"Decoded {total-dropped}/{total} messages ({dropped} dropped)")
+                # A name shared by messages needs a dtype holding both
+                dtypes[i] = np.result_type(dtypes[i], _signal_dtype(s))
+
+    # Resolve frame ids to their message definitions once, each paired with
+    # the (signal, column) pairs it scatters; messages left without wanted
+    # signals are skipped before decoding. Databases that do not expose
+    # messages fall back to decode_message per frame. Choices are not
+    # decoded here, load_blf maps raw values to labels afterwards.
+    decoders: Optional[_Decoders] = None
+    messages = getattr(db, "messages", None)
+    if messages is not None and all(hasattr(m, "frame_id") for m in messages):
+        decoders = {}
+        for m in messages:
+            if filter_ids is not None and m.frame_id not in filter_ids:
+                continue
+            plan = tuple((s.name, col_idx[s.name]) for s in m.signals if s.name in col_idx)
+            if plan:
+                decoders[m.frame_id] = (m, plan)
+
+    # Columns emitted even when absent from a chunk
+    fill: Container[int] = ()
+    if fill_missing:
+        if decoders is None:
+            # live view: names decoded later are filled from then on
+            fill = col_idx.values()
+        else:
+            fill = {i for _, plan in decoders.values() for _, i in plan}
+
+    size = config.chunk_size
+    total = 0
+    decoded = 0
+    # Progress advances per chunk so the read loop makes no tqdm call per frame
+    pbar = tqdm(
+        desc=p.name, unit="msg", disable=not config.progress_bar,
+        miniters=size, mininterval=0.5,
+    )
+    raw = config.raw_frame_reader
+    with pbar, blf_reader(blf_path, raw_frames=raw, prefetch=config.prefetch) as reader:
+        frames = iter(reader) if raw else (
+            (msg.arbitration_id, msg.data, msg.timestamp) for msg in reader
+        )
+        if decoders is None:
+            batches = _decode_generic(db, col_idx, filter_ids, sig_set, frames, size)
+        elif config.n_workers > 1:
+            # Workers must not be forked next to the prefetch thread
+            ctx = _thread_safe_mp_context() if config.prefetch else None
+            batches = _decode_parallel(
+                decoders, tuple(dtypes), frames, size, config.n_workers, ctx
+            )
+        else:
+            batches = _decode_serial(decoders, tuple(dtypes), frames, size)
+        for read, rows, buffers in batches:
+            total += read
+            decoded += rows
+            pbar.update(read)
+            if rows:
+                yield _buffers_to_frame(col_idx, buffers, rows, fill)
+    dropped = total - decoded
+    glogger.info(f"Decoded {decoded}/{total} messages ({dropped} dropped)")
 
 # ----------------------------------------------------------------------------
 # Full-file load with filtering, timing, injection, metadata, enums
 # ----------------------------------------------------------------------------
 
+def _fill_gaps(values: np.ndarray, x: np.ndarray, hold: bool) -> np.ndarray:
+    """
+    Internal: Fill NaN gaps of a float signal column.
+
+    Linear mode interpolates against ``x`` with np.interp; hold mode repeats
+    the last valid sample (zero-order hold), which never invents values a
+    quantized or enum signal cannot take. Leading gaps take the first valid
+    sample in both modes. Columns without gaps or without any sample are
+    returned unchanged.
+    """
+    if not np.issubdtype(values.dtype, np.floating):
+        return values
+    valid = ~np.isnan(values)
+    if valid.all() or not valid.any():
+        return values
+    if hold:
+        idx = np.where(valid, np.arange(len(values)), -1)
+        np.maximum.accumulate(idx, out=idx)
+        idx[idx < 0] = np.argmax(valid)
+        return values[idx]
+    return np.interp(x, x[valid], values[valid])
+
+
+def _choices_to_categorical(values: np.ndarray, choices: Dict[Any, Any]) -> pd.Categorical:
+    """
+    Internal: Map raw enum values to a Categorical of their choice labels.
+
+    Categories are the unique string labels in choice order. Raw values are
+    matched against the sorted choice keys with np.searchsorted, so sparse or
+    negative key ranges need no dense lookup table; unknown values and NaN
+    become missing.
+    """
+    labels = [str(lab) for lab in choices.values()]
+    cats = list(dict.fromkeys(labels))
+    cat_code = {lab: i for i, lab in enumerate(cats)}
+
+    keys = np.array([getattr(k, "value", k) for k in choices], dtype=np.float64)
+    key_codes = np.array([cat_code[lab] for lab in labels], dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    keys, key_codes = keys[order], key_codes[order]
+
+    if values.dtype == object:
+        raw = pd.to_numeric(
+            pd.Series(values).map(lambda x: getattr(x, "value", x)), errors="coerce"
+        ).to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        raw = values.astype(np.float64, copy=False)
+    pos = np.minimum(np.searchsorted(keys, raw), len(keys) - 1)
+    codes = np.where(keys[pos] == raw, key_codes[pos], -1)
+    return pd.Categorical.from_codes(codes, categories=cats)
+
+
+def _concat_chunk_columns(
+    chunks: Iterable[pd.DataFrame],
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Internal: Join streamed chunks column by column.
+
+    Only the column arrays of each chunk are retained. Once the total row
+    count is known every column is allocated once and the chunks are
+    copied into their slices, avoiding the block consolidation copy of
+    pd.concat; rows of chunks lacking a column are filled with NaN in
+    place, and int64 chunks of a uint64 signal join as uint64. Returns
+    None when no chunk was produced.
+    """
+    lengths: List[int] = []
+    parts: Dict[str, Dict[int, np.ndarray]] = {}
+    for chunk in chunks:
+        for name in chunk.columns:
+            parts.setdefault(name, {})[len(lengths)] = chunk[name].to_numpy()
+        lengths.append(len(chunk))
+    if not lengths:
+        return None
+
+    offsets = np.concatenate(([0], np.cumsum(lengths))).tolist()
+    columns: Dict[str, np.ndarray] = {}
+    for name, by_chunk in parts.items():
+        gaps = len(by_chunk) < len(lengths)
+        if len(lengths) == 1:
+            columns[name] = by_chunk[0]
+            continue
+        dtype = np.result_type(*by_chunk.values(), *((np.float64,) if gaps else ()))
+        kinds = {part.dtype.kind for part in by_chunk.values()}
+        if kinds == {"i", "u"} and not gaps:
+            # uint64 chunks next to ones that fit int64: join exactly
+            dtype = np.dtype(np.uint64)
+        out = np.empty(offsets[-1], dtype=dtype)
+        for i in range(len(lengths)):
+            part = by_chunk.get(i)
+            out[offsets[i]:offsets[i + 1]] = np.nan if part is None else part
+        columns[name] = out
+    return columns
+
+
+def _narrow_column(
+    values: np.ndarray, sig: Any, dtype: Any = None, integral: bool = True
+) -> np.ndarray:
+    """
+    Internal: Cast a decoded column to the narrowest dtype for sig.
+
+    An explicit dtype wins. Unscaled integer signals become the smallest
+    (u)int holding their bit length when ``integral`` and gap free, else
+    float32 if their values fit its 24-bit mantissa. Integer columns cast
+    exactly at any width; a float64 column is only cast to an integer for
+    signals of up to 53 bits, as wider values may already be rounded.
+    Scaled signals become float32; 64-bit floats and wide integers with
+    gaps stay float64.
+
+    Raises:
+        ValueError: If an integer dtype is requested for a column with gaps.
+    """
+    gaps = values.dtype.kind == "f" and bool(np.isnan(values).any())
+    if dtype is not None:
+        dt = np.dtype(dtype)
+        if gaps and np.issubdtype(dt, np.integer):
+            raise ValueError(f"Signal '{sig.name}' has gaps; cannot store as {dt}")
+        return values.astype(dt, copy=False)
+    length = getattr(sig, "length", 64)
+    if getattr(sig, "is_float", False):
+        return values.astype(np.float32) if length <= 32 else values
+    if getattr(sig, "scale", 1) == 1 and getattr(sig, "offset", 0) == 0:
+        exact = values.dtype.kind in "iu" or length <= 53
+        if integral and not gaps and exact and length <= 64:
+            bits = next(b for b in (8, 16, 32, 64) if length <= b)
+            kind = "int" if getattr(sig, "is_signed", False) else "uint"
+            return values.astype(f"{kind}{bits}")
+        return values.astype(np.float32) if length <= 24 else values
+    return values.astype(np.float32)
+
+
+def _db_signals(db: Any) -> Tuple[Any, ...]:
+    """
+    Internal: Signal definitions of all messages in DBC order, cached on db.
+
+    The tuple is stored on the database object together with the message
+    objects and their signal counts, and rebuilt when a message is added,
+    removed or replaced or gains or loses signals, so repeated loads with
+    one database skip the walk over every signal. The cache keeps the
+    messages alive, so their identities cannot be reused.
+    """
+    messages = tuple(db.messages)
+    counts = tuple(len(msg.signals) for msg in messages)
+    cached = getattr(db, "_canml_signals", None)
+    if cached is not None:
+        (cached_messages, cached_counts), cached_signals = cached
+        if cached_counts == counts and all(
+            a is b for a, b in zip(cached_messages, messages)
+        ):
+            return cached_signals
+    signals = tuple(sig for msg in messages for sig in msg.signals)
+    try:
+        db._canml_signals = ((messages, counts), signals)
+    except AttributeError:
+        pass
+    return signals
+
+
 def load_blf(
     blf_path: str,
     db: Union[CantoolsDatabase, str, List[str]],
@@ -271,6 +1051,7 @@ def load_blf(
       - Timestamp sorting and uniform spacing
       - Missing signal injection with dtype preservation
       - Metadata attributes and enum conversion
+      - Optional narrow per-signal dtypes from the DBC
     """
     config = config or CanmlConfig()
 
@@ -295,22 +1076,24 @@ def load_blf(
         glogger.warning("Empty message_ids provided; no messages will be decoded")
 
     # Determine signals to include
-    all_sigs: List[str] = [sig.name for msg in dbobj.messages for sig in msg.signals]
+    db_signals = _db_signals(dbobj)
+    all_sigs: List[str] = [sig.name for sig in db_signals]
     expected: List[str] = exp_list if exp_list is not None else all_sigs
 
     # Validate dtype_map
     dtype_map: Dict[str, Any] = config.dtype_map or {}
+    expected_set = set(expected)
     for sig, dt in dtype_map.items():
-        if sig not in expected:
+        if sig not in expected_set:
             raise ValueError(f"dtype_map contains unknown signal: {sig}")
         try:
             pd.Series(dtype=dt)
         except Exception:
             raise ValueError(f"Invalid dtype '{dt}' for signal '{sig}'")
 
-    # Stream decode
+    # Stream decode, accumulating column arrays instead of whole chunks
     try:
-        chunks = list(iter_blf_chunks(
+        columns = _concat_chunk_columns(iter_blf_chunks(
             blf_path, dbobj, config, message_ids, expected
         ))
     except FileNotFoundError:
@@ -319,80 +1102,86 @@ def load_blf(
         glogger.error("Failed to process BLF chunks", exc_info=True)
         raise ValueError(f"Failed to process BLF data: {e}") from e
 
-    # Concatenate or create empty
-    if not chunks:
+    if columns is None:
         glogger.warning(f"No data decoded from {blf_path}; returning empty DataFrame")
-        df = pd.DataFrame({
-            "timestamp": pd.Series(dtype=float),
-            **{sig: pd.Series(dtype=dtype_map.get(sig, float)) for sig in expected}
-        })
-    else:
-        df = pd.concat(chunks, ignore_index=True)
-
-    # Keep only timestamp + expected signals
-    cols_keep = [c for c in ["timestamp"] + expected if c in df.columns]
-    df = df[cols_keep]
+        columns = {"timestamp": np.empty(0, dtype=float)}
+    n = len(next(iter(columns.values())))
 
-    # Sort and uniform timing
-    if config.sort_timestamps:
-        df = df.sort_values("timestamp").reset_index(drop=True)
+    # Sort and uniform timing, applied to the raw arrays
+    if config.sort_timestamps and "timestamp" in columns:
+        ts = columns["timestamp"]
+        if n > 1 and not (ts[1:] >= ts[:-1]).all():
+            order = np.argsort(ts, kind="stable")
+            columns = {name: arr[order] for name, arr in columns.items()}
+    raw_ts: Optional[np.ndarray] = None
     if config.force_uniform_timing:
-        df["raw_timestamp"] = df["timestamp"]
-        df["timestamp"] = np.arange(len(df)) * config.interval_seconds
+        raw_ts = columns.get("timestamp")
+        uniform = np.arange(n, dtype=np.float64)
+        uniform *= config.interval_seconds
+        columns["timestamp"] = uniform
 
-    # Inject missing signals
+    # Assemble timestamp + expected signals, injecting missing ones
+    data: Dict[str, Any] = {
+        c: columns[c] for c in ["timestamp"] + expected if c in columns
+    }
+    present = set(data)
+    if raw_ts is not None:
+        data["raw_timestamp"] = raw_ts
     reserved = {"timestamp", "raw_timestamp"}
     for sig in expected:
-        if sig in reserved:
+        if sig in reserved or sig in data:
             continue
-        if sig not in df.columns:
-            dt = np.dtype(dtype_map.get(sig, float))
-            if config.interpolate_missing and sig in all_sigs:
-                srs = pd.Series(np.nan, index=df.index, dtype=dt)
-                df[sig] = srs.interpolate(method="linear", limit_direction="both")
-            elif np.issubdtype(dt, np.integer):
-                df[sig] = np.zeros(len(df), dtype=dt)
-            else:
-                df[sig] = pd.Series(np.nan, index=df.index, dtype=dt)
+        dt = np.dtype(dtype_map.get(sig, float))
+        if np.issubdtype(dt, np.integer):
+            data[sig] = np.zeros(n, dtype=dt)
+        else:
+            data[sig] = np.full(n, np.nan, dtype=dt)
 
-    # Metadata attributes
-    df.attrs["signal_attributes"] = {
-        sig.name: getattr(sig, "attributes", {})
-        for msg in dbobj.messages for sig in msg.signals
-        if sig.name in df.columns
-    }
+    # Metadata attributes, gap filling and enum conversion from the DBC
+    if config.interpolate_missing:
+        ts = data.get("timestamp")
+        if ts is None or (n > 1 and not (ts[1:] >= ts[:-1]).all()):
+            ts = np.arange(n, dtype=np.float64)
+    # linear interpolation leaves fractional values in integer signals
+    linear = config.interpolate_missing and config.interpolation_method == "linear"
+    attrs: Dict[str, Any] = {}
+    for sig in db_signals:
+        if sig.name not in data:
+            continue
+        choices = getattr(sig, "choices", None)
+        if config.interpolate_missing and sig.name in present:
+            data[sig.name] = _fill_gaps(
+                data[sig.name], ts,
+                hold=bool(choices) or config.interpolation_method == "zoh",
+            )
+        attrs[sig.name] = getattr(sig, "attributes", {})
+        if choices:
+            data[sig.name] = _choices_to_categorical(data[sig.name], choices)
+        elif config.narrow_dtypes and sig.name in present:
+            data[sig.name] = _narrow_column(
+                data[sig.name], sig, dtype_map.get(sig.name), integral=not linear
+            )
 
-    # Enum conversion: safely map values to string labels
-    for msg in dbobj.messages:
-        for sig in msg.signals:
-            if sig.name in df.columns and getattr(sig, "choices", None):
-                # new code: dedupe categories, preserving order
-                choices = sig.choices  # raw → label
-                # map raw→string label
-                def _map_label(x):
-                    raw = getattr(x, 'value', x)
-                    lbl = choices.get(raw, raw)
-                    return str(lbl)
-
-                # build a unique list of labels
-                labels = [str(lab) for lab in choices.values()]
-                # preserve first‐seen order
-                seen = set()
-                cats = []
-                for lab in labels:
-                    if lab not in seen:
-                        seen.add(lab)
-                        cats.append(lab)
-
-                # apply mapping and assign categorical with unique categories
-                df[sig.name] = df[sig.name].apply(_map_label)
-                df[sig.name] = pd.Categorical(df[sig.name], categories=cats)
-                
+    # Single construction: one consolidation, no per-column insertion
+    df = pd.DataFrame(data, copy=False)
+    df.attrs["signal_attributes"] = attrs
     return df
 
 # ----------------------------------------------------------------------------
 # CSV export
 # ----------------------------------------------------------------------------
+def _write_csv_arrow(df: pd.DataFrame, path: Path, mode: str, header: bool) -> None:
+    """
+    Internal: Write a DataFrame to CSV with pyarrow's C++ writer.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with open(path, mode + "b") as fh:
+        pacsv.write_csv(table, fh, write_options=pacsv.WriteOptions(include_header=header))
+
+
 def to_csv(
     df_or_iter: Union[pd.DataFrame, Iterable[pd.DataFrame]],
     output_path: str,
@@ -401,6 +1190,7 @@ def to_csv(
     pandas_kwargs: Optional[Dict[str, Any]] = None,
     columns: Optional[List[str]] = None,
     metadata_path: Optional[str] = None,
+    engine: str = "pandas",
 ) -> None:
     """
     Write DataFrame or chunks to CSV with side-car metadata JSON.
@@ -413,6 +1203,12 @@ def to_csv(
         pandas_kwargs (dict): Extra pandas.to_csv args.
         columns (list): Subset of columns to write.
         metadata_path (str): Path to JSON for signal_attributes.
+        engine (str): 'pandas' or 'pyarrow'. The pyarrow writer is multithreaded
+            and much faster on large frames, but quotes strings and formats
+            floats and booleans differently; it accepts no pandas_kwargs.
+
+    Raises:
+        ValueError: On duplicate columns or an unsupported engine.
     """
     import json
 
@@ -420,24 +1216,38 @@ def to_csv(
     pandas_kwargs = pandas_kwargs or {}
     if columns and len(columns) != len(set(columns)):
         raise ValueError("Duplicate columns specified")
+    if engine not in ("pandas", "pyarrow"):
+        raise ValueError(f"Unsupported CSV engine: {engine}")
+    if engine == "pyarrow" and pandas_kwargs:
+        raise ValueError("pandas_kwargs are not supported with engine='pyarrow'")
     p.parent.mkdir(parents=True, exist_ok=True)
 
-    def _write(block: pd.DataFrame, m, h, wmeta):
-        block.to_csv(p, mode=m, header=h, index=False, columns=columns, **pandas_kwargs)
-        if metadata_path and wmeta:
-            mpath = Path(metadata_path)
-            mpath.parent.mkdir(parents=True, exist_ok=True)
-            attrs = block.attrs.get("signal_attributes", {c: {} for c in block.columns})
-            mpath.write_text(json.dumps(attrs))
+    def _write(block: pd.DataFrame, m, h):
+        if engine == "pyarrow":
+            _write_csv_arrow(block[columns] if columns else block, p, m, h)
+        else:
+            block.to_csv(p, mode=m, header=h, index=False, columns=columns, **pandas_kwargs)
+
+    def _write_meta(block: pd.DataFrame):
+        mpath = Path(metadata_path)
+        mpath.parent.mkdir(parents=True, exist_ok=True)
+        attrs = block.attrs.get("signal_attributes", {c: {} for c in block.columns})
+        mpath.write_text(json.dumps(attrs))
 
     if isinstance(df_or_iter, pd.DataFrame):
-        _write(df_or_iter, mode, header, True)
+        _write(df_or_iter, mode, header)
+        if metadata_path:
+            _write_meta(df_or_iter)
     else:
-        first = True
-        for chunk in df_or_iter:
-            _write(chunk, mode if first else "a",
-                   header if first else False, first)
-            first = False
+        chunks = iter(df_or_iter)
+        first = next(chunks, None)
+        if first is not None:
+            # Metadata comes from the first chunk, written once
+            _write(first, mode, header)
+            if metadata_path:
+                _write_meta(first)
+            for chunk in chunks:
+                _write(chunk, "a", False)
 
     glogger.info(f"CSV written to {output_path}")
 
@@ -479,3 +1289,85 @@ def to_parquet(
         mpath.write_text(json.dumps(attrs))
         glogger.info(f"Metadata written to {mpath}")
     glogger.info(f"Parquet written to {output_path}")
+
+
+def to_parquet_stream(
+    chunks: Iterable[pd.DataFrame],
+    output_path: str,
+    compression: str = "snappy",
+    columns: Optional[List[str]] = None,
+    metadata_path: Optional[str] = None,
+) -> None:
+    """
+    Stream DataFrame chunks to Parquet, one row group per chunk.
+
+    Chunks go through pyarrow's ParquetWriter as they arrive, so the full
+    data set is never held in memory. The schema comes from the first chunk
+    restricted to ``columns``; columns a chunk lacks are written as nulls.
+    Chunks from iter_blf_chunks omit signals absent from them, so pass
+    ``fill_missing=True`` there (or explicit columns) when messages may
+    first appear after the first chunk. A failed write removes the
+    partial file.
+
+    Args:
+        chunks (iterable): DataFrame chunks, e.g. from iter_blf_chunks.
+        output_path (str): Destination .parquet file path.
+        compression (str): Parquet codec.
+        columns (list): Columns to write. Defaults to the first chunk's.
+        metadata_path (str): JSON path for signal_attributes of the first chunk.
+
+    Raises:
+        ValueError: On duplicate columns, a chunk with columns outside the
+            schema, or a failed write.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if columns and len(columns) != len(set(columns)):
+        raise ValueError("Duplicate columns specified")
+    p = Path(output_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+
+    writer = None
+    first = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                first = chunk
+                columns = list(columns or chunk.columns)
+                schema = pa.Schema.from_pandas(
+                    chunk.reindex(columns=columns), preserve_index=False
+                )
+                writer = pq.ParquetWriter(p, schema, compression=compression)
+            else:
+                extra = [c for c in chunk.columns if c not in schema.names]
+                if extra:
+                    raise ValueError(
+                        f"chunk columns {extra} not in schema; pass columns explicitly"
+                    )
+            table = pa.Table.from_pandas(
+                chunk.reindex(columns=columns), schema=schema, preserve_index=False
+            )
+            writer.write_table(table)
+    except Exception as e:
+        if writer is not None:
+            # Do not leave a truncated file behind
+            writer.close()
+            writer = None
+            p.unlink(missing_ok=True)
+        glogger.error(f"Failed to export Parquet {p}: {e}", exc_info=True)
+        raise ValueError(f"Failed to export Parquet: {e}") from e
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if first is None:
+        glogger.warning(f"No chunks to write; {output_path} not created")
+        return
+    if metadata_path:
+        mpath = Path(metadata_path)
+        mpath.parent.mkdir(parents=True, exist_ok=True)
+        attrs = first.attrs.get("signal_attributes", {c: {} for c in first.columns})
+        mpath.write_text(json.dumps(attrs))
+        glogger.info(f"Metadata written to {mpath}")
+    glogger.info(f"Parquet written to {output_path}")
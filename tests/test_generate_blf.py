@@ -0,0 +1,309 @@
+"""
+Module: tests/test_generate_blf.py
+
+This test suite verifies the fast encoding path of the BLF generator in
+`examples/generate_blf.py` using pytest. CI builds BLF fixtures with this
+script, so its payloads must match cantools bit for bit. It ensures:
+  - Generated packers match Message.encode for mixed byte order, signed,
+    offset and enumerated signals
+  - Frames flagged invalid (out of range or too wide for the signal) are
+    exactly those Message.encode rejects
+  - Values drawn by draw_columns always take the packer path
+  - Multiplexed and float messages get no packer
+  - generate_signal_value draws within signal_bounds, endpoints included,
+    and only enumerated values for enum signals
+  - cached_bounds computes signal_bounds once per signal object
+  - cached_choice_keys is the tuple of enumerated raw values, or None
+  - run() with jobs=2 produces the same frames as jobs=1 for one seed
+  - --compression levels 0 and 9 decode to the same frames
+  - run() with a seed is reproducible frame for frame
+  - Messages without a packer encode bulk-checked frames with strict=False
+    exactly as strict encode does; out-of-range frames are logged and None
+  - run() output loads with load_blf; check_options rejects missing DBCs,
+    jobs < 1 and compression outside -1..9
+  - main() only turns argument errors into usage errors, and a failed
+    write still closes the output file
+  - BulkBLFWriter.write_frames writes the same bytes as
+    BLFWriter.on_message_received, across container splits and split calls
+
+Prerequisites:
+  pip install pytest numpy cantools python-can
+
+To execute:
+    pytest tests/test_generate_blf.py -v
+"""
+import logging
+from pathlib import Path
+
+import pytest
+import numpy as np
+import can
+import cantools
+from can.io.blf import BLFWriter
+
+from canml.canmlio import CanmlConfig, load_blf
+from examples import generate_blf
+
+TEST_DBC = str(Path(__file__).parent / 'test.dbc')
+
+PACK_DBC = (
+    'BO_ 1 M: 8 X\n'
+    ' SG_ LeU : 3|11@1+ (1,0) [0|2000] "" X\n'
+    ' SG_ LeS : 14|9@1- (0.5,-3) [-100|100] "" X\n'
+    ' SG_ BeU : 39|12@0+ (0.1,40) [40|449.5] "" X\n'
+    ' SG_ BeS : 55|16@0- (2,-10) [-30000|30000] "" X\n'
+    ' SG_ Bit : 40|1@1+ (1,0) [0|1] "" X\n'
+    ' SG_ Nb : 41|3@1+ (1,0) [0|0] "" X\n'
+    'VAL_ 1 Nb 0 "a" 7 "b" ;\n'
+)
+
+
+def _frames(path):
+    """Decoded (arbitration_id, data, time since first frame) of a BLF file.
+
+    Relative times are rounded to microseconds: the wall-clock start
+    differs between runs and absolute float timestamps near 1.7e9 carry
+    sub-microsecond noise.
+    """
+    messages = list(can.BLFReader(str(path)))
+    t0 = messages[0].timestamp
+    return [
+        (m.arbitration_id, bytes(m.data), round(m.timestamp - t0, 6))
+        for m in messages
+    ]
+
+
+def _encode_or_none(msg, names, values):
+    try:
+        return msg.encode(dict(zip(names, values)))
+    except Exception:
+        return None
+
+
+def test_packer_matches_cantools_encode():
+    msg = cantools.database.load_string(PACK_DBC, database_format='dbc').get_message_by_frame_id(1)
+    plan = generate_blf.build_msg_plan(msg)
+    assert plan.pack is not None
+    rng = np.random.default_rng(1)
+    n = 3000
+    # Values around and beyond each signal's range, on and off its scale grid
+    columns = []
+    for sig in msg.signals:
+        if sig.scale == 1 and sig.offset == 0:
+            columns.append(rng.integers(-5, 2 ** sig.length + 5, n))
+        else:
+            lo, hi = sig.minimum * 1.2 - 5, sig.maximum * 1.2 + 5
+            columns.append(rng.uniform(lo, hi, n).round(2))
+    valid = invalid = 0
+    for ok, raw, values in generate_blf.frame_rows(plan, columns, n):
+        expected = _encode_or_none(msg, plan.signal_names, values)
+        if ok:
+            assert plan.pack(*raw) == expected
+            valid += 1
+        else:
+            assert expected is None
+            invalid += 1
+    assert valid and invalid
+
+
+def test_packer_matches_generated_values():
+    msg = cantools.database.load_string(PACK_DBC, database_format='dbc').get_message_by_frame_id(1)
+    plan = generate_blf.build_msg_plan(msg)
+    n = 500
+    columns = generate_blf.draw_columns(np.random.default_rng(2), plan, n)
+    for ok, raw, values in generate_blf.frame_rows(plan, columns, n):
+        assert ok
+        assert plan.pack(*raw) == msg.encode(dict(zip(plan.signal_names, values)))
+
+
+def test_no_packer_for_multiplexed_or_float():
+    db = cantools.database.load_string(
+        'BO_ 1 Mx: 2 X\n'
+        ' SG_ Sel M : 0|8@1+ (1,0) [0|1] "" X\n'
+        ' SG_ P m0 : 8|8@1+ (1,0) [0|100] "" X\n'
+        'BO_ 2 F: 4 X\n'
+        ' SG_ Fl : 0|32@1- (1,0) [0|0] "" X\n'
+        'SIG_VALTYPE_ 2 Fl : 1;\n',
+        database_format='dbc',
+    )
+    for msg in db.messages:
+        assert generate_blf.make_packer(msg) is None
+
+
+def test_generate_signal_value_bounds():
+    db = cantools.database.load_string(
+        PACK_DBC + 'BO_ 2 S: 1 X\n SG_ Two : 0|2@1+ (1,0) [1|2] "" X\n',
+        database_format='dbc',
+    )
+    rng = np.random.default_rng(5)
+    for msg in db.messages:
+        for sig in msg.signals:
+            values = [generate_blf.generate_signal_value(sig, rng) for _ in range(400)]
+            if sig.choices:
+                assert set(values) <= set(sig.choices)
+                continue
+            raw_min, raw_max, scale = generate_blf.signal_bounds(sig)
+            raws = [round(v / scale) for v in values]
+            assert min(raws) >= raw_min and max(raws) <= raw_max
+            if raw_max - raw_min < 10:
+                # endpoint=True: both ends of small ranges are drawn
+                assert {raw_min, raw_max} <= set(raws)
+    two = db.get_message_by_frame_id(2).signals[0]
+    # a fresh default Generator is used without rng
+    assert generate_blf.generate_signal_value(two) in (1, 2)
+
+
+def test_cached_bounds_per_signal(monkeypatch):
+    db = cantools.database.load_string(PACK_DBC, database_format='dbc')
+    calls = []
+    bounds = generate_blf.signal_bounds
+    monkeypatch.setattr(generate_blf, 'signal_bounds', lambda sig: calls.append(sig) or bounds(sig))
+    monkeypatch.setattr(generate_blf, '_BOUNDS', {})
+    signals = db.messages[0].signals
+    for _ in range(3):
+        assert [generate_blf.cached_bounds(sig) for sig in signals] == [bounds(sig) for sig in signals]
+    assert len(calls) == len(signals)
+    # a fresh copy of the database gets its own entries
+    again = cantools.database.load_string(PACK_DBC, database_format='dbc').messages[0].signals
+    generate_blf.cached_bounds(again[0])
+    assert len(calls) == len(signals) + 1
+
+
+def test_cached_choice_keys():
+    msg = cantools.database.load_string(PACK_DBC, database_format='dbc').messages[0]
+    for sig in msg.signals:
+        keys = generate_blf.cached_choice_keys(sig)
+        if sig.choices:
+            assert keys == (0, 7) and keys is generate_blf.cached_choice_keys(sig)
+        else:
+            assert keys is None
+    plan = generate_blf.build_msg_plan(msg)
+    nb = plan.signal_names.index('Nb')
+    assert plan.choices[nb].tolist() == [0, 7]
+    assert all(c is None for j, c in enumerate(plan.choices) if j != nb)
+
+
+@pytest.mark.parametrize('max_container_size', [48 * 3, 500, 131072])
+def test_bulk_writer_matches_blfwriter(tmp_path, max_container_size):
+    frames = [
+        (i % 0x7FF, bytes([i % 256]) * (1 + i % 8), 100.0 + i * 0.001)
+        for i in range(3000)
+    ]
+    bulk_path, ref_path = tmp_path / 'bulk.blf', tmp_path / 'ref.blf'
+    # write_frames is called in pieces so state carries over between calls
+    bulk = generate_blf.BulkBLFWriter(str(bulk_path), max_container_size=max_container_size)
+    for start, stop in ((0, 1), (1, 1234), (1234, 1234), (1234, len(frames))):
+        bulk.write_frames(iter(frames[start:stop]))
+    bulk.stop()
+    ref = BLFWriter(str(ref_path), max_container_size=max_container_size)
+    for arbitration_id, data, timestamp in frames:
+        ref.on_message_received(can.Message(
+            arbitration_id=arbitration_id, data=data, timestamp=timestamp,
+            is_extended_id=False, channel=None,
+        ))
+    ref.stop()
+    assert bulk_path.read_bytes() == ref_path.read_bytes()
+    assert len(list(can.BLFReader(str(bulk_path)))) == len(frames)
+
+
+def test_run_jobs_independent(tmp_path):
+    # Each message type gets its own SeedSequence child, pooled or not
+    generate_blf.run(TEST_DBC, tmp_path / 'j1.blf', 200, 0.01, jobs=1, seed=11)
+    generate_blf.run(TEST_DBC, tmp_path / 'j2.blf', 200, 0.01, jobs=2, seed=11)
+    serial = _frames(tmp_path / 'j1.blf')
+    assert len(serial) == 4 * 200
+    assert _frames(tmp_path / 'j2.blf') == serial
+
+
+def test_run_compression_levels(tmp_path):
+    generate_blf.run(TEST_DBC, tmp_path / 'c0.blf', 300, 0.01, compression=0, seed=3)
+    generate_blf.run(TEST_DBC, tmp_path / 'c9.blf', 300, 0.01, compression=9, seed=3)
+    # stored vs deflated containers: different files, same frames
+    assert (tmp_path / 'c9.blf').stat().st_size < (tmp_path / 'c0.blf').stat().st_size
+    assert _frames(tmp_path / 'c9.blf') == _frames(tmp_path / 'c0.blf')
+
+
+def test_run_seed_reproducible(tmp_path):
+    # Files are compared by decoded frames: the BLF header records the
+    # wall-clock time, so bytes only match with a frozen clock
+    for name, seed in (('a.blf', 42), ('b.blf', 42), ('c.blf', 43)):
+        generate_blf.run(TEST_DBC, tmp_path / name, 100, 0.01, seed=seed)
+    first = _frames(tmp_path / 'a.blf')
+    assert _frames(tmp_path / 'b.blf') == first
+    assert _frames(tmp_path / 'c.blf') != first
+
+
+def test_unpacked_message_strict_equivalence(monkeypatch, caplog):
+    msg = cantools.database.load_string(
+        'BO_ 1 F: 8 X\n'
+        ' SG_ A : 0|32@1- (0.5,1) [-100|100] "" X\n'
+        ' SG_ B : 32|8@1+ (1,0) [0|200] "" X\n'
+        'SIG_VALTYPE_ 1 A : 1;\n',
+        database_format='dbc',
+    ).get_message_by_frame_id(1)
+    plan = generate_blf.build_msg_plan(msg)
+    assert plan.pack is None and plan.checked
+    n = 2000
+    rng = np.random.default_rng(7)
+    columns = [
+        rng.uniform(-130, 130, n).round(1),
+        rng.integers(-20, 280, n),
+    ]
+    monkeypatch.setattr(generate_blf, 'draw_columns', lambda rng, plan, num: columns)
+    with caplog.at_level(logging.WARNING, logger='generate_blf'):
+        payloads = generate_blf.encode_stream(plan, rng, n)
+    rows = zip(*[col.tolist() for col in columns])
+    invalid = 0
+    for payload, values in zip(payloads, rows):
+        expected = _encode_or_none(msg, plan.signal_names, values)
+        assert payload == expected
+        invalid += payload is None
+    assert 0 < invalid < n
+    warnings = [r for r in caplog.records if 'Error encoding F' in r.getMessage()]
+    assert len(warnings) == invalid
+
+
+def test_run_output_loads(tmp_path):
+    out = tmp_path / 'x.blf'
+    generate_blf.run(TEST_DBC, out, 100, 0.01)
+    df = load_blf(str(out), TEST_DBC, CanmlConfig(progress_bar=False))
+    assert len(df) == 4 * 100
+    assert {'EngineRPM', 'VehicleSpeed', 'BrakePressure', 'AmbientTemp'} <= set(df.columns)
+
+
+def test_check_options(tmp_path):
+    assert generate_blf.check_options(TEST_DBC) == [Path(TEST_DBC)]
+    with pytest.raises(FileNotFoundError):
+        generate_blf.check_options([TEST_DBC, str(tmp_path / 'missing.dbc')])
+    with pytest.raises(ValueError):
+        generate_blf.check_options(TEST_DBC, jobs=0)
+    for level in (-2, 10):
+        with pytest.raises(ValueError):
+            generate_blf.check_options(TEST_DBC, compression=level)
+
+
+def test_main_error_mapping(tmp_path, monkeypatch):
+    out = str(tmp_path / 'm.blf')
+    monkeypatch.setattr('sys.argv', ['generate_blf.py', '-d', TEST_DBC, '-o', out, '-j', '0'])
+    with pytest.raises(SystemExit) as exc:
+        generate_blf.main()
+    assert exc.value.code == 2
+
+    # a failure while generating keeps its type and traceback
+    def bad_stream(plan, rng, num_msgs):
+        raise ValueError('low > high')
+    monkeypatch.setattr(generate_blf, 'encode_stream', bad_stream)
+    monkeypatch.setattr('sys.argv', ['generate_blf.py', '-d', TEST_DBC, '-o', out])
+    with pytest.raises(ValueError, match='low > high'):
+        generate_blf.main()
+
+
+def test_run_closes_file_on_write_error(tmp_path, monkeypatch):
+    writers = []
+    def failing_write(self, frames):
+        writers.append(self)
+        raise RuntimeError('disk full')
+    monkeypatch.setattr(generate_blf.BulkBLFWriter, 'write_frames', failing_write)
+    with pytest.raises(RuntimeError, match='disk full'):
+        generate_blf.run(TEST_DBC, tmp_path / 'w.blf', 10, 0.01)
+    assert writers and writers[0].file.closed
@@ -13,9 +13,21 @@ Test Cases:
   - Single chunk grouping works
   - Chunk splitting by chunk_size
   - filter_ids filters messages by arbitration ID
+  - filter_ids accepts any iterable of IDs
   - filter_signals filters decoded signal keys
   - stop() exceptions are suppressed on reader close
   - progress_bar toggle does not affect output
+  - signals absent from a frame are NaN in the columnar chunk
+  - cantools databases decode via per-id messages with raw enum values
+  - filter_signals skips cantools messages without wanted signals
+  - n_workers > 1 decodes in a process pool with identical output
+  - n_workers < 1 raises ValueError
+  - raw_frame_reader matches can.Message reading and skips remote/error frames
+  - compiled signal scatter matches cantools decode bit for bit
+  - cantools fallback scatter drops short and undecodable multiplexed frames
+  - prefetch reads on a background thread with identical output
+  - prefetch re-raises reader errors and stops its thread on early exit
+  - prefetch with n_workers > 1 starts pool workers without forking
 
 Best Practices:
   - Uses pytest tmp_path for dummy BLF files
@@ -24,9 +36,14 @@ Best Practices:
   - Verifies DataFrame contents and shapes
 """
 
+import warnings
+
 import pytest
 import pandas as pd
 import numpy as np
+import can
+import cantools
+from can.io.blf import BLFReader, BLFWriter
 import canml.canmlio as canmlio
 from canml.canmlio import iter_blf_chunks, CanmlConfig
 
@@ -126,6 +143,13 @@ def test_filter_ids(blf_file):
     assert list(df['sig']) == [6]
     assert list(df['timestamp']) == [0.6]
 
+def test_filter_ids_iterable(blf_file):
+    cfg = CanmlConfig(progress_bar=False)
+    DummyReader.msgs = [DummyMsg(5, 50, 0.5), DummyMsg(6, 60, 0.6)]
+    ids = (i for i in [6, 7])
+    df = pd.concat(list(iter_blf_chunks(blf_file, DummyDB(), cfg, filter_ids=ids)))
+    assert list(df['sig']) == [6]
+
 def test_filter_signals(blf_file):
     cfg = CanmlConfig(progress_bar=False)
     # DB decode returns two keys; filter_signals picks only 'val'
@@ -163,3 +187,208 @@ def test_progress_bar_toggle(blf_file):
     df1 = pd.concat(chunks1, ignore_index=True)
     df2 = pd.concat(chunks2, ignore_index=True)
     pd.testing.assert_frame_equal(df1, df2)
+
+def test_sparse_signals_are_nan(blf_file):
+    cfg = CanmlConfig(progress_bar=False)
+    # each frame decodes a different signal set
+    class SparseDB(DummyDB):
+        def decode_message(self, arbitration_id, data):
+            return {"a": data} if arbitration_id == 1 else {"b": data}
+    DummyReader.msgs = [DummyMsg(1, 10, 0.0), DummyMsg(2, 20, 0.1)]
+    df = list(iter_blf_chunks(blf_file, SparseDB(), cfg))[0]
+    assert df['a'].iloc[0] == 10 and np.isnan(df['a'].iloc[1])
+    assert np.isnan(df['b'].iloc[0]) and df['b'].iloc[1] == 20
+    assert df['timestamp'].dtype == np.float64
+
+def test_cantools_db_decodes_raw_choices(blf_file):
+    cfg = CanmlConfig(progress_bar=False)
+    db = cantools.database.load_string(
+        'BO_ 1 M: 1 X\n'
+        ' SG_ Mode : 0|8@1+ (1,0) [0|3] "" X\n'
+        'VAL_ 1 Mode 0 "Off" 1 "On" ;\n',
+        database_format='dbc',
+    )
+    DummyReader.msgs = [DummyMsg(1, b'\x01', 0.0), DummyMsg(2, b'\x00', 0.1)]
+    chunks = list(iter_blf_chunks(blf_file, db, cfg))
+    df = chunks[0]
+    # unknown id 2 dropped, enum kept as its raw value
+    assert list(df['Mode']) == [1]
+
+def test_cantools_db_filter_signals_skips_messages(blf_file):
+    cfg = CanmlConfig(progress_bar=False)
+    db = cantools.database.load_string(
+        'BO_ 1 A: 1 X\n'
+        ' SG_ A1 : 0|8@1+ (1,0) [0|255] "" X\n'
+        'BO_ 2 B: 1 X\n'
+        ' SG_ B1 : 0|4@1+ (1,0) [0|15] "" X\n'
+        ' SG_ B2 : 4|4@1+ (1,0) [0|15] "" X\n',
+        database_format='dbc',
+    )
+    DummyReader.msgs = [DummyMsg(1, b'\x07', 0.0), DummyMsg(2, b'\x21', 0.1)]
+    df = list(iter_blf_chunks(blf_file, db, cfg, filter_signals=['B2']))[0]
+    assert list(df.columns) == ['timestamp', 'B2']
+    assert list(df['B2']) == [2]
+    assert list(df['timestamp']) == [0.1]
+
+def test_parallel_matches_serial(blf_file):
+    db = cantools.database.load_string(
+        'BO_ 1 A: 2 X\n'
+        ' SG_ A1 : 0|16@1+ (0.5,0) [0|1000] "" X\n'
+        'BO_ 2 B: 1 X\n'
+        ' SG_ B1 : 0|8@1+ (1,0) [0|255] "" X\n',
+        database_format='dbc',
+    )
+    DummyReader.msgs = [
+        DummyMsg(1 + i % 3, bytes([i % 256, 1]), i * 0.01) for i in range(50)
+    ]
+    serial = list(iter_blf_chunks(blf_file, db, CanmlConfig(chunk_size=8, progress_bar=False)))
+    parallel = list(iter_blf_chunks(
+        blf_file, db, CanmlConfig(chunk_size=8, progress_bar=False, n_workers=2)
+    ))
+    pd.testing.assert_frame_equal(
+        pd.concat(serial, ignore_index=True), pd.concat(parallel, ignore_index=True)
+    )
+    assert all(len(df) <= 8 for df in parallel)
+
+def test_invalid_n_workers():
+    with pytest.raises(ValueError):
+        CanmlConfig(n_workers=0)
+
+def test_raw_frame_reader(tmp_path, monkeypatch):
+    monkeypatch.setattr(canmlio, "BLFReader", BLFReader)
+    path = tmp_path / "real.blf"
+    writer = BLFWriter(str(path))
+    writer.on_message_received(can.Message(arbitration_id=1, data=b'\x05', timestamp=1.0))
+    writer.on_message_received(can.Message(arbitration_id=1, is_remote_frame=True, timestamp=1.1))
+    writer.on_message_received(can.Message(is_error_frame=True, timestamp=1.2))
+    writer.on_message_received(can.Message(
+        arbitration_id=0x1ABCDE, is_extended_id=True, data=b'\x07', timestamp=1.3))
+    writer.on_message_received(can.Message(
+        arbitration_id=1, is_fd=True, data=b'\x09' + bytes(11), timestamp=1.4))
+    writer.stop()
+    db = cantools.database.load_string(
+        'BO_ 1 A: 1 X\n'
+        ' SG_ A1 : 0|8@1+ (1,0) [0|255] "" X\n'
+        'BO_ 2149235934 E: 1 X\n'
+        ' SG_ E1 : 0|8@1+ (1,0) [0|255] "" X\n',
+        database_format='dbc',
+    )
+    raw = pd.concat(list(iter_blf_chunks(
+        str(path), db, CanmlConfig(progress_bar=False, raw_frame_reader=True)
+    )), ignore_index=True)
+    assert list(raw['A1'].dropna()) == [5, 9]
+    assert list(raw['E1'].dropna()) == [7]
+    msgs = pd.concat(list(iter_blf_chunks(
+        str(path), db, CanmlConfig(progress_bar=False)
+    )), ignore_index=True)
+    pd.testing.assert_frame_equal(raw, msgs)
+
+def test_compiled_scatter_matches_cantools():
+    db = cantools.database.load_string(
+        'BO_ 1 M: 8 X\n'
+        ' SG_ LeU : 3|11@1+ (1,0) [0|2047] "" X\n'
+        ' SG_ LeS : 14|9@1- (0.5,-3) [-131|125] "" X\n'
+        ' SG_ BeU : 39|12@0+ (0.1,40) [40|449.5] "" X\n'
+        ' SG_ BeS : 55|16@0- (1,0) [-32768|32767] "" X\n'
+        ' SG_ Bit : 40|1@1+ (1,0) [0|1] "" X\n'
+        'BO_ 2 F: 4 X\n'
+        ' SG_ Fl : 0|32@1- (1,0) [0|0] "" X\n'
+        'SIG_VALTYPE_ 2 Fl : 1;\n',
+        database_format='dbc',
+    )
+    m = db.get_message_by_frame_id(1)
+    plan = tuple((s.name, i) for i, s in enumerate(m.signals))
+    scatter = canmlio._compiled_scatter(m, plan)
+    assert scatter is not None
+    float_msg = db.get_message_by_frame_id(2)
+    assert canmlio._compiled_scatter(float_msg, (('Fl', 0),)) is None
+    rng = np.random.default_rng(0)
+    payloads = [bytes(rng.integers(0, 256, 8, dtype=np.uint8)) for _ in range(200)]
+    payloads += [b'\x00' * 8, b'\xff' * 8, b'\xff' * 9]
+    ts, cols, mask = canmlio._alloc_buffers(len(payloads), len(plan))
+    for row, data in enumerate(payloads):
+        assert scatter(data, row, cols, mask)
+        expected = m.decode(data, decode_choices=False)
+        for name, i in plan:
+            assert cols[i][row] == expected[name]
+    assert all(mk.all() for mk in mask)
+    assert not scatter(b'\x00' * 7, 0, cols, mask)
+
+def test_fallback_scatter_multiplexed():
+    db = cantools.database.load_string(
+        'BO_ 1 M: 2 X\n'
+        ' SG_ Mux M : 0|8@1+ (1,0) [0|255] "" X\n'
+        ' SG_ A m1 : 8|8@1+ (1,0) [0|255] "" X\n'
+        ' SG_ B m2 : 8|8@1+ (2,0) [0|510] "" X\n',
+        database_format='dbc',
+    )
+    m = db.get_message_by_frame_id(1)
+    plan = (('A', 0), ('B', 1))
+    assert canmlio._compiled_scatter(m, plan) is None
+    scatter = canmlio._fallback_scatter(m, plan)
+    ts, cols, mask = canmlio._alloc_buffers(3, 2)
+    assert scatter(b'\x01\x05', 0, cols, mask)
+    assert scatter(b'\x02\x05', 1, cols, mask)
+    assert not scatter(b'\x01', 2, cols, mask)
+    assert not scatter(b'\x07\x05', 2, cols, mask)
+    assert cols[0][0] == 5 and cols[1][1] == 10
+    assert mask[0].tolist() == [True, False, False]
+    assert mask[1].tolist() == [False, True, False]
+
+def test_prefetch_matches_direct(blf_file):
+    DummyReader.msgs = [DummyMsg(i % 3, i, i * 0.1) for i in range(10000)]
+    direct = list(iter_blf_chunks(blf_file, DummyDB(), CanmlConfig(progress_bar=False)))
+    prefetched = list(iter_blf_chunks(
+        blf_file, DummyDB(), CanmlConfig(progress_bar=False, prefetch=True)
+    ))
+    pd.testing.assert_frame_equal(
+        pd.concat(direct, ignore_index=True), pd.concat(prefetched, ignore_index=True)
+    )
+
+def test_prefetch_errors_and_early_exit():
+    def failing():
+        yield 1
+        raise RuntimeError("corrupt container")
+    reader = canmlio._PrefetchReader(failing(), batch_size=1)
+    with pytest.raises(RuntimeError, match="corrupt"):
+        list(reader)
+    reader.close()
+
+    def endless():
+        i = 0
+        while True:
+            yield i
+            i += 1
+    reader = canmlio._PrefetchReader(endless(), batch_size=8, depth=2)
+    it = iter(reader)
+    assert [next(it) for _ in range(20)] == list(range(20))
+    reader.close()
+    assert not reader._thread.is_alive()
+
+def test_prefetch_with_process_pool(blf_file, monkeypatch):
+    db = cantools.database.load_string(
+        'BO_ 1 A: 2 X\n'
+        ' SG_ A1 : 0|16@1+ (0.5,0) [0|1000] "" X\n'
+        'BO_ 2 B: 1 X\n'
+        ' SG_ B1 : 0|8@1+ (1,0) [0|255] "" X\n',
+        database_format='dbc',
+    )
+    DummyReader.msgs = [
+        DummyMsg(1 + i % 3, bytes([i % 256, 1]), i * 0.01) for i in range(200)
+    ]
+    contexts = []
+    parallel = canmlio._decode_parallel
+    def spy(*args):
+        contexts.append(args[-1])
+        return parallel(*args)
+    monkeypatch.setattr(canmlio, "_decode_parallel", spy)
+    serial = list(iter_blf_chunks(blf_file, db, CanmlConfig(chunk_size=16, progress_bar=False)))
+    cfg = CanmlConfig(chunk_size=16, progress_bar=False, n_workers=2, prefetch=True)
+    with warnings.catch_warnings():
+        # Python 3.12+ warns when forking a process with running threads
+        warnings.simplefilter("error", DeprecationWarning)
+        combined = list(iter_blf_chunks(blf_file, db, cfg))
+    pd.testing.assert_frame_equal(
+        pd.concat(serial, ignore_index=True), pd.concat(combined, ignore_index=True)
+    )
+    assert contexts[-1].get_start_method() != "fork"
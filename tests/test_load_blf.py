@@ -15,16 +15,26 @@ Test Cases:
   - DBC path string/list invokes load_dbc_files
   - Empty message_ids yields empty DataFrame with warning
   - Chunk concatenation from iter_blf_chunks
+  - Chunks with differing columns are joined with NaN gaps
   - filter_ids filters messages by ID
   - filter_signals filters decoded fields
   - force_uniform_timing transforms timestamps and preserves raw_timestamp
   - sort_timestamps sorts
+  - sort_timestamps reorders every column and keeps file order on ties
   - expected_signals injection preserves integer dtype
   - duplicate expected_signals raises ValueError
   - invalid dtype_map signal raises ValueError
   - invalid interval_seconds raises ValueError
+  - interpolate_missing fills gaps linearly over timestamps or by holding
+  - unknown interpolation_method raises ValueError
+  - narrow_dtypes picks per-signal dtypes from the DBC, dtype_map wins
+  - 64-bit integer signals decode exactly and integer signals keep int64
   - timestamp is first column
   - metadata_attrs appear in DataFrame attrs
+  - DBC signal metadata is cached on the database and refreshed on change
+  - the cache notices replaced messages and signals added to or removed
+    from an existing message
+  - enum signals become categoricals of their choice labels
   - error in iter_blf_chunks propagates as ValueError
 
 Best Practices:
@@ -142,6 +152,18 @@ def test_chunk_concat_and_filter(monkeypatch, dummy_db):
     assert list(df['x']) == [1,2]
 
 
+def test_chunk_concat_missing_columns(monkeypatch, dummy_db):
+    """Columns absent from a chunk are NaN-filled for its rows."""
+    def dummy_chunks(path, db, config, fids, fsigs):
+        yield pd.DataFrame([{'timestamp':0.1,'x':1.0}])
+        yield pd.DataFrame([{'timestamp':0.2,'y':2.0},{'timestamp':0.3,'y':3.0}])
+    monkeypatch.setattr(canmlio, 'iter_blf_chunks', dummy_chunks)
+    df = load_blf('p.blf', dummy_db, config=CanmlConfig(), expected_signals=['x','y'])
+    assert list(df['timestamp']) == [0.1, 0.2, 0.3]
+    assert df['x'].iloc[0] == 1.0 and df['x'].iloc[1:].isna().all()
+    assert df['y'].iloc[0:1].isna().all() and list(df['y'].iloc[1:]) == [2.0, 3.0]
+
+
 def test_filter_signals(monkeypatch, dummy_db):
     """filter_signals drops unwanted keys."""
     def dummy_chunks(path, db, config, fids, fsigs):
@@ -172,6 +194,17 @@ def test_sort_timestamps(monkeypatch, dummy_db):
     assert list(df['timestamp']) == [1,2]
 
 
+def test_sort_timestamps_stable(monkeypatch, dummy_db):
+    """Rows move with their timestamps; equal timestamps keep file order."""
+    def dummy_chunks(*args, **kwargs):
+        yield pd.DataFrame({'timestamp':[2.0,1.0,1.0], 'v':[30.0,10.0,20.0]})
+    monkeypatch.setattr(canmlio, 'iter_blf_chunks', dummy_chunks)
+    cfg = CanmlConfig(sort_timestamps=True)
+    df = load_blf('p.blf', dummy_db, config=cfg, expected_signals=['v'])
+    assert list(df['timestamp']) == [1.0,1.0,2.0]
+    assert list(df['v']) == [10.0,20.0,30.0]
+
+
 def test_expected_signals_and_dtype(monkeypatch, dummy_db):
     """Missing signal injected with correct dtype int32."""
     def dummy_chunks(*args, **kwargs): yield pd.DataFrame([{'timestamp':0}])
@@ -199,6 +232,185 @@ def test_invalid_interval_values():
         CanmlConfig(interval_seconds=0)
 
 
+@pytest.fixture
+def gap_db(monkeypatch):
+    """Fake DB with a plain signal 'a' and an enum signal 'e'."""
+    class SigObj:
+        def __init__(self,name,choices=None): self.name=name; self.attributes={}; self.choices=choices
+    class Msg:
+        def __init__(self,sigs): self.signals=sigs
+    fake_db = type('FakeDB', (), {})()
+    fake_db.messages = [Msg([SigObj('a'), SigObj('e', {0:'Off', 2:'On'})])]
+    monkeypatch.setattr(canmlio, 'load_dbc_files', lambda x: fake_db)
+    chunk = pd.DataFrame({'timestamp':[0.0,1.0,3.0,5.0],
+                          'a':[np.nan,0.0,np.nan,4.0],
+                          'e':[0.0,np.nan,np.nan,2.0]})
+    monkeypatch.setattr(canmlio, 'iter_blf_chunks', lambda *args, **kwargs: iter([chunk]))
+    return fake_db
+
+
+def test_interpolate_missing_linear(gap_db, sample_blf):
+    """Linear fill follows timestamps; leading gaps take the first sample."""
+    cfg = CanmlConfig(interpolate_missing=True)
+    df = load_blf(sample_blf, 'dummy.dbc', config=cfg)
+    assert list(df['a']) == [0.0,0.0,2.0,4.0]
+    # enum signals are held rather than interpolated
+    assert df['e'].tolist() == ['Off','Off','Off','On']
+
+
+def test_interpolate_missing_zoh(gap_db, sample_blf):
+    """Zero-order hold repeats the last valid sample."""
+    cfg = CanmlConfig(interpolate_missing=True, interpolation_method='zoh')
+    df = load_blf(sample_blf, 'dummy.dbc', config=cfg)
+    assert list(df['a']) == [0.0,0.0,0.0,4.0]
+
+
+def test_invalid_interpolation_method():
+    """Unknown interpolation_method raises in config."""
+    with pytest.raises(ValueError):
+        CanmlConfig(interpolation_method='cubic')
+
+
+def test_narrow_dtypes(monkeypatch, sample_blf):
+    """narrow_dtypes stores each signal in the narrowest dtype for its DBC entry."""
+    import cantools
+    db = cantools.database.load_string(
+        'BO_ 1 M: 8 X\n'
+        ' SG_ u8 : 0|8@1+ (1,0) [0|255] "" X\n'
+        ' SG_ s12 : 8|12@1- (1,0) [-2048|2047] "" X\n'
+        ' SG_ sc : 20|10@1+ (0.5,0) [0|511] "" X\n'
+        ' SG_ gap : 30|8@1+ (1,0) [0|255] "" X\n'
+        ' SG_ ovr : 38|8@1+ (1,0) [0|255] "" X\n'
+        'BO_ 2 W: 8 X\n'
+        ' SG_ w60 : 0|60@1+ (1,0) [0|0] "" X\n',
+        database_format='dbc',
+    )
+    chunk = pd.DataFrame({'timestamp': [0.0, 1.0], 'u8': [3.0, 255.0],
+                          's12': [-5.0, 7.0], 'sc': [0.5, 1.5],
+                          'gap': [1.0, np.nan], 'ovr': [1.0, 2.0],
+                          'w60': [1.0, 2.0**59]})
+    monkeypatch.setattr(canmlio, 'iter_blf_chunks', lambda *a, **k: iter([chunk]))
+    cfg = CanmlConfig(narrow_dtypes=True, dtype_map={'ovr': 'int32'})
+    df = load_blf(sample_blf, db, config=cfg)
+    assert df.dtypes.to_dict() == {
+        'timestamp': np.float64, 'u8': np.uint8, 's12': np.int16,
+        'sc': np.float32, 'gap': np.float32, 'ovr': np.int32,
+        # float input wider than 53 bits is not cast to an integer
+        'w60': np.float64,
+    }
+    assert list(df['s12']) == [-5, 7]
+    assert list(df['sc']) == [0.5, 1.5]
+    # an integer override cannot hold gaps
+    cfg = CanmlConfig(narrow_dtypes=True, dtype_map={'gap': 'uint8'})
+    with pytest.raises(ValueError):
+        load_blf(sample_blf, db, config=cfg)
+    # off by default
+    assert (load_blf(sample_blf, db).dtypes[1:] == np.float64).all()
+
+
+def test_wide_integer_signals_exact(tmp_path):
+    """Integer signals beyond 53 bits are not rounded through float64."""
+    import can
+    import cantools
+    db = cantools.database.load_string(
+        'BO_ 1 C: 8 X\n'
+        ' SG_ Cnt : 0|64@1+ (1,0) [0|0] "" X\n'
+        'BO_ 2 S: 8 X\n'
+        ' SG_ Neg : 0|64@1- (1,0) [0|0] "" X\n'
+        'BO_ 3 K: 2 X\n'
+        ' SG_ Lin : 0|8@1+ (2,-10) [0|0] "" X\n'
+        ' SG_ Fr : 8|8@1+ (0.5,0) [0|0] "" X\n',
+        database_format='dbc',
+    )
+    path = tmp_path / 'wide.blf'
+    writer = can.BLFWriter(str(path))
+    counts = [2**60 + 1, 2**60 + 3, 2**64 - 1]
+    for i, v in enumerate(counts):
+        writer.on_message_received(can.Message(
+            arbitration_id=1, data=v.to_bytes(8, 'little'), timestamp=i))
+        writer.on_message_received(can.Message(
+            arbitration_id=2, data=(-(2**60) - i).to_bytes(8, 'little', signed=True),
+            timestamp=i + 0.1))
+        writer.on_message_received(can.Message(
+            arbitration_id=3, data=bytes([i, 3]), timestamp=i + 0.2))
+    writer.stop()
+    cfg = CanmlConfig(progress_bar=False)
+
+    df = load_blf(str(path), db, cfg, message_ids={1}, expected_signals=['Cnt'])
+    assert df['Cnt'].dtype == np.uint64
+    assert [int(v) for v in df['Cnt']] == counts
+    # values fitting int64 come back as int64, as pandas would infer
+    df = load_blf(str(path), db, cfg, message_ids={2}, expected_signals=['Neg'])
+    assert df['Neg'].dtype == np.int64
+    assert list(df['Neg']) == [-(2**60), -(2**60) - 1, -(2**60) - 2]
+    # chunks of both kinds join without rounding
+    small = CanmlConfig(progress_bar=False, chunk_size=1)
+    df = load_blf(str(path), db, small, message_ids={1}, expected_signals=['Cnt'])
+    assert [int(v) for v in df['Cnt']] == counts
+    narrow = CanmlConfig(progress_bar=False, narrow_dtypes=True)
+    df = load_blf(str(path), db, narrow, message_ids={1}, expected_signals=['Cnt'])
+    assert df['Cnt'].dtype == np.uint64
+    assert [int(v) for v in df['Cnt']] == counts
+    # gap-free integer-scaled signals stay int64, fractional scales float64
+    df = load_blf(str(path), db, cfg, message_ids={3}, expected_signals=['Lin', 'Fr'])
+    assert df['Lin'].dtype == np.int64 and list(df['Lin']) == [-10, -8, -6]
+    assert df['Fr'].dtype == np.float64 and list(df['Fr']) == [1.5, 1.5, 1.5]
+
+
+def test_db_signal_cache(gap_db, sample_blf):
+    """Signal definitions are walked once per database until messages change."""
+    load_blf(sample_blf, 'dummy.dbc')
+    first = gap_db._canml_signals[1]
+    assert [s.name for s in first] == ['a', 'e']
+    load_blf(sample_blf, 'dummy.dbc')
+    assert gap_db._canml_signals[1] is first
+    gap_db.messages.append(type(gap_db.messages[0])([type(first[0])('b')]))
+    df = load_blf(sample_blf, 'dummy.dbc')
+    assert [s.name for s in gap_db._canml_signals[1]] == ['a', 'e', 'b']
+    assert 'b' in df.columns
+
+
+def test_db_signal_cache_mutations(tmp_path):
+    """Mutating messages of a cached database refreshes its signals."""
+    import can
+    import cantools
+    db = cantools.database.load_string(
+        'BO_ 1 A: 2 X\n'
+        ' SG_ a1 : 0|8@1+ (1,0) [0|255] "" X\n'
+        'BO_ 2 B: 2 X\n'
+        ' SG_ b1 : 0|8@1+ (1,0) [0|255] "" X\n',
+        database_format='dbc',
+    )
+    path = tmp_path / 'mut.blf'
+    writer = can.BLFWriter(str(path))
+    writer.on_message_received(can.Message(arbitration_id=1, data=b'\x01\x02', timestamp=0.0))
+    writer.on_message_received(can.Message(arbitration_id=2, data=b'\x03\x04', timestamp=0.1))
+    writer.stop()
+    cfg = CanmlConfig(progress_bar=False)
+    assert list(load_blf(str(path), db, cfg).columns) == ['timestamp', 'a1', 'b1']
+    # a signal added to an existing message
+    other = cantools.database.load_string(
+        'BO_ 1 A: 2 X\n'
+        ' SG_ a1 : 0|8@1+ (1,0) [0|255] "" X\n'
+        ' SG_ a2 : 8|8@1+ (1,0) [0|255] "" X\n'
+        'BO_ 2 B: 2 X\n'
+        ' SG_ b2 : 8|8@1+ (1,0) [0|255] "" X\n',
+        database_format='dbc',
+    )
+    db.messages[0].signals.append(other.messages[0].signals[1])
+    df = load_blf(str(path), db, cfg)
+    assert list(df.columns) == ['timestamp', 'a1', 'a2', 'b1']
+    assert list(df['a2'].dropna()) == [2]
+    # a message replaced with one of the same signal count
+    db.messages[1] = other.messages[1]
+    df = load_blf(str(path), db, cfg)
+    assert list(df.columns) == ['timestamp', 'a1', 'a2', 'b2']
+    assert list(df['b2'].dropna()) == [4]
+    # a signal removed again
+    db.messages[0].signals.pop()
+    assert list(load_blf(str(path), db, cfg).columns) == ['timestamp', 'a1', 'b2']
+
+
 def test_timestamp_first(monkeypatch, dummy_db):
     """timestamp column is first in result."""
     def dummy_chunks(*args, **kwargs): yield pd.DataFrame([{'timestamp':1,'b':2,'a':3}])
@@ -225,6 +437,23 @@ def test_metadata_attrs(monkeypatch, tmp_path, sample_blf):
     assert 'a' in df.attrs['signal_attributes']
 
 
+def test_enum_choices_categorical(monkeypatch, sample_blf):
+    """Raw enum values map to deduplicated labels; unknown and NaN are missing."""
+    class SigObj:
+        def __init__(self,name,choices): self.name=name; self.attributes={}; self.choices=choices
+    class Msg:
+        def __init__(self,sigs): self.signals=sigs
+    fake_db = type('FakeDB', (), {})()
+    fake_db.messages = [Msg([SigObj('m', {-1:'Err', 0:'Off', 1:'On', 5:'On'})])]
+    monkeypatch.setattr(canmlio, 'load_dbc_files', lambda x: fake_db)
+    chunk = pd.DataFrame({'timestamp':[0,1,2,3,4], 'm':[1.0, -1.0, 5.0, 7.0, np.nan]})
+    monkeypatch.setattr(canmlio, 'iter_blf_chunks', lambda *args, **kwargs: iter([chunk]))
+    df = load_blf(sample_blf, 'dummy.dbc', config=CanmlConfig())
+    assert list(df['m'].cat.categories) == ['Err','Off','On']
+    assert df['m'].tolist()[:3] == ['On','Err','On']
+    assert df['m'].iloc[3:].isna().all()
+
+
 def test_iter_error_propagates(monkeypatch, dummy_db):
     """Exceptions in iter_blf_chunks raise ValueError."""
     monkeypatch.setattr(canmlio, 'iter_blf_chunks', lambda *a,**k: (_ for _ in ()).throw(RuntimeError('boom')))
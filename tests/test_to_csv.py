@@ -8,8 +8,11 @@ This test suite verifies the behavior of the `to_csv` function in the
   - Column filtering/reordering
   - Duplicate columns detection
   - Metadata JSON export for both DataFrame and chunks
+  - Chunked metadata comes from the first chunk only
   - Proper logging
   - Error on non-DataFrame/non-iterable input
+  - pyarrow engine round-trips single frames and appended chunks
+  - Unsupported engine and pandas_kwargs with pyarrow raise ValueError
 
 Prerequisites:
   pip install pytest pandas
@@ -73,6 +76,14 @@ def test_write_iterable_chunks(tmp_path, chunks, caplog):
     assert f"CSV written to {out}" in caplog.text
 
 
+def test_chunk_metadata_from_first_chunk(tmp_path, chunks):
+    later = chunks[1].copy()
+    later.attrs['signal_attributes'] = {'a': {'unit': 'changed'}}
+    meta = tmp_path / 'meta.json'
+    canmlio.to_csv(iter([chunks[0], later]), str(tmp_path / 'c.csv'), metadata_path=str(meta))
+    assert json.loads(meta.read_text()) == chunks[0].attrs['signal_attributes']
+
+
 def test_columns_filter_and_order(tmp_path):
     df = pd.DataFrame({'x': [1], 'y':[2], 'z':[3]})
     out = tmp_path / 'cols.csv'
@@ -123,3 +134,22 @@ def test_metadata_path_dir_created(tmp_path):
     assert meta.exists()
     data = json.loads(meta.read_text())
     assert 'd' in data
+
+def test_pyarrow_engine(tmp_path, chunks):
+    pytest.importorskip("pyarrow")
+    out = tmp_path / "arrow.csv"
+    meta = tmp_path / "arrow.json"
+    canmlio.to_csv(iter(chunks), str(out), columns=['b', 'a'],
+                   metadata_path=str(meta), engine="pyarrow")
+    expected = pd.concat(chunks, ignore_index=True)[['b', 'a']]
+    pd.testing.assert_frame_equal(pd.read_csv(out), expected)
+    assert json.loads(meta.read_text()) == chunks[0].attrs['signal_attributes']
+    canmlio.to_csv(chunks[0], str(out), mode='a', header=False, engine="pyarrow")
+    assert len(pd.read_csv(out)) == len(expected) + len(chunks[0])
+
+def test_invalid_engine_options(tmp_path, sample_df):
+    with pytest.raises(ValueError):
+        canmlio.to_csv(sample_df, str(tmp_path / "x.csv"), engine="polars")
+    with pytest.raises(ValueError):
+        canmlio.to_csv(sample_df, str(tmp_path / "x.csv"), engine="pyarrow",
+                       pandas_kwargs={"sep": ";"})
@@ -0,0 +1,117 @@
+"""
+Module: tests/test_to_parquet_stream.py
+
+This test suite verifies the behavior of the `to_parquet_stream` function in
+the `canml.canmlio` module using pytest. It ensures:
+  - Chunks are written as one row group each and read back concatenated
+  - Columns missing from later chunks are written as nulls
+  - Columns outside the schema raise ValueError
+  - Explicit columns select and order the written schema
+  - Metadata JSON export from the first chunk
+  - No file is created for an empty iterable
+  - iter_blf_chunks output with a late message needs fill_missing; a failed
+    write leaves no partial file
+  - Proper logging
+
+Prerequisites:
+  pip install pytest pandas pyarrow
+
+To execute:
+    pytest tests/test_to_parquet_stream.py -v
+"""
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import logging
+from pathlib import Path
+import pyarrow.parquet as pq
+import can
+from can.io.blf import BLFWriter
+
+import canml.canmlio as canmlio
+
+@pytest.fixture(autouse=True)
+def setup_logging(caplog):
+    caplog.set_level(logging.INFO, logger=canmlio.__name__)
+    yield
+    canmlio.glogger.setLevel(logging.INFO)
+
+@pytest.fixture
+def chunks():
+    first = pd.DataFrame({'timestamp': [0.0, 0.1], 'x': [1.0, 2.0], 'y': [3.0, 4.0]})
+    first.attrs['signal_attributes'] = {'x': {'unit': 'V'}}
+    second = pd.DataFrame({'timestamp': [0.2], 'x': [5.0]})
+    return [first, second]
+
+
+def test_row_group_per_chunk(tmp_path, chunks, caplog):
+    out = tmp_path / 'stream.parquet'
+    canmlio.to_parquet_stream(iter(chunks), str(out))
+    assert pq.ParquetFile(out).num_row_groups == 2
+    df = pd.read_parquet(out)
+    assert list(df.columns) == ['timestamp', 'x', 'y']
+    assert list(df['x']) == [1.0, 2.0, 5.0]
+    # y absent from second chunk => null
+    assert np.isnan(df['y'].iloc[2])
+    assert f"Parquet written to {out}" in caplog.text
+
+
+def test_extra_columns_error(tmp_path, chunks):
+    chunks[1]['z'] = 1.0
+    with pytest.raises(ValueError):
+        canmlio.to_parquet_stream(chunks, str(tmp_path / 'bad.parquet'))
+
+
+def test_explicit_columns(tmp_path, chunks):
+    out = tmp_path / 'cols.parquet'
+    canmlio.to_parquet_stream(chunks, str(out), columns=['x', 'timestamp'])
+    df = pd.read_parquet(out)
+    assert list(df.columns) == ['x', 'timestamp']
+
+
+def test_metadata_export(tmp_path, chunks):
+    out = tmp_path / 'nested' / 'data.parquet'
+    meta = tmp_path / 'nested' / 'meta.json'
+    canmlio.to_parquet_stream(chunks, str(out), compression='gzip', metadata_path=str(meta))
+    assert out.exists()
+    assert json.loads(meta.read_text()) == {'x': {'unit': 'V'}}
+
+
+def test_empty_iterable(tmp_path, caplog):
+    out = tmp_path / 'empty.parquet'
+    canmlio.to_parquet_stream(iter([]), str(out))
+    assert not out.exists()
+    assert 'No chunks to write' in caplog.text
+
+def test_late_message_from_iter_blf_chunks(tmp_path):
+    db = canmlio.load_dbc_files(str(Path(__file__).parent / 'test.dbc'))
+    blf = tmp_path / 'late.blf'
+    writer = BLFWriter(str(blf))
+    engine = db.get_message_by_frame_id(100)
+    env = db.get_message_by_frame_id(400)
+    for i in range(100):
+        data = engine.encode({'EngineRPM': i, 'ThrottlePosition': 1, 'CoolantTemp': 80})
+        writer.on_message_received(can.Message(arbitration_id=100, data=data, timestamp=i * 0.01))
+    data = env.encode({'AmbientTemp': 20, 'CabinTemp': 21, 'RainfallRate': 0.5})
+    writer.on_message_received(can.Message(arbitration_id=400, data=data, timestamp=1.0))
+    writer.stop()
+    cfg = canmlio.CanmlConfig(chunk_size=50, progress_bar=False)
+    out = tmp_path / 'late.parquet'
+
+    # the first chunk lacks the late message's signals
+    with pytest.raises(ValueError):
+        canmlio.to_parquet_stream(canmlio.iter_blf_chunks(str(blf), db, cfg), str(out))
+    assert not out.exists()
+
+    chunks = list(canmlio.iter_blf_chunks(str(blf), db, cfg, fill_missing=True))
+    assert len({tuple(c.columns) for c in chunks}) == 1
+    canmlio.to_parquet_stream(iter(chunks), str(out))
+    read = pd.read_parquet(out)
+    assert len(read) == 101
+    assert read['AmbientTemp'].isna().sum() == 100
+    assert read['AmbientTemp'].iloc[-1] == 20
+    assert list(read['EngineRPM'].iloc[:100]) == list(range(100))
+    # only signals of decoded messages are filled
+    only = list(canmlio.iter_blf_chunks(str(blf), db, cfg, filter_ids={400}, fill_missing=True))
+    assert list(only[0].columns) == ['timestamp', 'AmbientTemp', 'CabinTemp', 'RainfallRate']